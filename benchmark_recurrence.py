@@ -0,0 +1,128 @@
+"""
+Compare recurrence expansion with time zones against the old naive path.
+
+Run with: python benchmark_recurrence.py
+Exits with status 1 if the first (cold) zoned run is slower than
+MAX_COLD_RATIO times the naive expansion, or later (warm) runs are slower
+than MAX_RATIO times it. Each figure is the best of several runs; every
+cold run starts from a freshly loaded scheduler.
+"""
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from timeit import repeat
+from dateutil.rrule import rrule, WEEKLY
+from dateutil.relativedelta import relativedelta
+from booking_manager import BookingScheduler, local_to_utc, utc_day_offset
+
+ZONE = 'America/New_York'
+# Warm runs reuse the expanded series and must be at least as fast as the
+# naive path; the first run also converts every instance it expands
+MAX_RATIO = 1.0
+MAX_COLD_RATIO = 1.5
+
+def naive_instances(booking, start_date, end_date):
+    """
+    Expansion as it worked before bookings carried a zone
+    """
+    start = datetime.fromisoformat(booking['start'])
+    end = datetime.fromisoformat(booking['end'])
+    duration = end - start
+    until = datetime.fromisoformat(booking['recurrence']['until'])
+
+    instances = []
+    for dt in rrule(freq=WEEKLY, dtstart=start, until=min(until, end_date)):
+        if dt >= start_date:
+            instance_end = dt + duration
+            instances.append({
+                'start': dt.isoformat(),
+                'end': instance_end.isoformat()
+            })
+    return instances
+
+def months(first, count):
+    return [(first + relativedelta(months=i), first + relativedelta(months=i + 1)) for i in range(count)]
+
+def weekly_series(count, first, until):
+    """
+    count weekly series starting a few minutes apart, as (naive, zoned)
+    booking lists
+    """
+    naive, zoned = [], []
+    for i in range(count):
+        local_start = first + timedelta(minutes=5 * i)
+        naive.append({
+            'name': f"naive {i}",
+            'start': local_start.isoformat(),
+            'end': (local_start + timedelta(hours=1)).isoformat(),
+            'recurrence': {'type': 'weekly', 'until': until.isoformat()}
+        })
+        start = local_to_utc(local_start, ZONE)
+        zoned.append({
+            'name': f"zoned {i}",
+            'start': start.isoformat(),
+            'end': (start + timedelta(hours=1)).isoformat(),
+            'timezone': ZONE,
+            'recurrence': {'type': 'weekly', 'until': until.isoformat()}
+        })
+    return naive, zoned
+
+def main():
+    # (label, series, windows, runs): one series over 50 years, read whole
+    # and five years month by month as calendar redraws do, and more series
+    # than the old 1024-entry cache held, redrawn month by month for a year
+    cases = [
+        ('whole span', weekly_series(1, datetime(2000, 1, 3, 9, 0), datetime(2049, 12, 31, 23, 59)),
+         [(datetime(2000, 1, 1), datetime(2050, 1, 1))], 20),
+        ('month by month', weekly_series(1, datetime(2000, 1, 3, 9, 0), datetime(2049, 12, 31, 23, 59)),
+         months(datetime(2020, 1, 1), 12 * 5), 20),
+        ('1,100 series', weekly_series(1100, datetime(2024, 1, 1, 8, 0), datetime(2026, 12, 31, 23, 59)),
+         months(datetime(2024, 1, 1), 12), 3),
+    ]
+
+    failed = False
+    with tempfile.TemporaryDirectory() as directory:
+        for label, (naive_bookings, zoned_bookings), windows, runs in cases:
+            storage = os.path.join(directory, f"{len(zoned_bookings)} {label}.json")
+            scheduler = BookingScheduler(storage, timezone=ZONE, user='benchmark')
+            scheduler.apply_changes([(None, booking) for booking in zoned_bookings], 'import')
+            zoned_windows = [(local_to_utc(lo, ZONE), local_to_utc(hi, ZONE)) for lo, hi in windows]
+
+            def run_naive():
+                for lo, hi in windows:
+                    for booking in naive_bookings:
+                        naive_instances(booking, lo, hi)
+
+            def run_zoned(scheduler):
+                for lo, hi in zoned_windows:
+                    for booking in scheduler.bookings:
+                        scheduler.get_recurrence_instances(booking, lo, hi)
+
+            def run_cold():
+                # Nothing expanded or converted yet, as just after start
+                fresh = BookingScheduler(storage, timezone=ZONE, user='benchmark')
+                utc_day_offset.cache_clear()
+                return min(repeat(lambda: run_zoned(fresh), number=1, repeat=1))
+
+            naive = min(repeat(run_naive, number=1, repeat=runs))
+            cold = min(run_cold() for _ in range(runs))
+            warm = min(repeat(lambda: run_zoned(scheduler), number=1, repeat=runs))
+
+            print(f"{label}: {len(windows)} window(s), best of {runs} runs")
+            print(f"  naive:            {naive * 1000:9.2f} ms per run")
+            print(f"  zoned (cold):     {cold * 1000:9.2f} ms for a first run, "
+                  f"{cold / naive:.4f}x naive (bound {MAX_COLD_RATIO}x)")
+            print(f"  zoned (warm):     {warm * 1000:9.2f} ms per run, "
+                  f"{warm / naive:.4f}x naive (bound {MAX_RATIO}x)")
+            if cold / naive > MAX_COLD_RATIO:
+                print(f"  FAILED: the first run is slower than {MAX_COLD_RATIO}x naive")
+                failed = True
+            if warm / naive > MAX_RATIO:
+                print(f"  FAILED: later runs are slower than {MAX_RATIO}x naive")
+                failed = True
+
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
@@ -1,41 +1,403 @@
-from datetime import datetime, timedelta, date
+from datetime import datetime, timedelta, date, time, timezone
 from colorama import init, Fore, Style
 from tabulate import tabulate
 import json
 import os
 import calendar
+import getpass
+from bisect import bisect_left, bisect_right, insort
+from functools import lru_cache
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 from dateutil.rrule import rrule, WEEKLY, MONTHLY, YEARLY
 from dateutil.relativedelta import relativedelta
+from booking_store import BookingStore
+
+PAGE_SIZE = 20
+# Zone assumed for bookings saved before zones were stored. UTC keeps the
+# wall times of old files unchanged.
+DEFAULT_TIMEZONE = 'UTC'
+UTC = timezone.utc
+
+@lru_cache(maxsize=None)
+def get_zone(name):
+    """
+    Look up a zone by IANA name, e.g. 'Europe/Berlin'
+    """
+    return ZoneInfo(name)
+
+# Conversions add offsets to these rather than calling datetime.replace,
+# which costs more than the rest of a conversion
+EPOCH = datetime(1970, 1, 1)
+EPOCH_UTC = EPOCH.replace(tzinfo=UTC)
+
+def local_to_utc(wall, zone_name):
+    """
+    Convert a naive wall-clock time in zone_name to an aware UTC datetime.
+    Times skipped by a DST gap resolve with the offset in force before the gap.
+    Looking up the offset is cheap enough that memoizing it per time or per
+    day only adds cost.
+    """
+    return EPOCH_UTC + (wall - EPOCH - get_zone(zone_name).utcoffset(wall))
+
+def utc_isoformat(instant):
+    """
+    instant.isoformat() for an aware UTC datetime, formatted as a naive time
+    with the offset appended, which is several times faster
+    """
+    return (EPOCH + (instant - EPOCH_UTC)).isoformat() + '+00:00'
+
+def system_timezone():
+    """
+    IANA name of the system's zone, from TZ or /etc/localtime. Falls back to
+    UTC where neither names a known zone, e.g. on Windows.
+    """
+    names = [os.environ.get('TZ', '')]
+    if os.path.exists('/etc/localtime'):
+        names.append(os.path.realpath('/etc/localtime').partition('zoneinfo/')[2])
+    for name in names:
+        if not name:
+            continue
+        try:
+            get_zone(name)
+            return name
+        except (ZoneInfoNotFoundError, ValueError):
+            pass
+    return DEFAULT_TIMEZONE
+
+@lru_cache(maxsize=65536)
+def utc_day_offset(zone_name, day):
+    """
+    UTC offset of zone_name for instants on the UTC day, or None if it
+    changes during the day
+    """
+    zone = get_zone(zone_name)
+    offset = datetime.combine(day, time(), UTC).astimezone(zone).utcoffset()
+    if datetime.combine(day + timedelta(days=1), time(), UTC).astimezone(zone).utcoffset() != offset:
+        return None
+    return offset
+
+def utc_to_local(instant, zone_name):
+    """
+    Convert an aware datetime to a naive wall-clock time in zone_name.
+    Offsets are memoized per UTC day, since calendar views convert every
+    instance they show and astimezone costs several times the lookup.
+    """
+    utc = EPOCH + (instant - EPOCH_UTC)
+    offset = utc_day_offset(zone_name, utc.date())
+    if offset is None:
+        return instant.astimezone(get_zone(zone_name)).replace(tzinfo=None)
+    return utc + offset
+
+FREQUENCIES = {'weekly': WEEKLY, 'monthly': MONTHLY, 'yearly': YEARLY}
+
+class RecurringSeries:
+    """
+    Instances of one recurring booking, expanded lazily. The series is only
+    expanded as far as the latest window asked for, and later windows carry
+    on from there, so conflict checks and calendar redraws neither expand a
+    series twice nor expand years nobody looks at. The instances are shared
+    and must not be modified.
+    """
+    def __init__(self, booking):
+        recurrence = booking['recurrence']
+        self.key = self.key_of(booking)
+        self.zone_name = booking.get('timezone', DEFAULT_TIMEZONE)
+        start = datetime.fromisoformat(booking['start'])
+        self.duration = datetime.fromisoformat(booking['end']) - start
+        # The until date is a wall-clock time in the booking's zone
+        self._pending = iter(rrule(freq=FREQUENCIES[recurrence['type']],
+                                   dtstart=utc_to_local(start, self.zone_name),
+                                   until=datetime.fromisoformat(recurrence['until'])))
+        self.instances, self.starts, self.ends = [], [], []
+
+    @staticmethod
+    def key_of(booking):
+        """
+        Everything the instances depend on, to tell when a booking changed
+        """
+        recurrence = booking['recurrence']
+        return (booking['start'], booking['end'], booking.get('timezone'),
+                recurrence['type'], recurrence['until'])
+
+    def between(self, start_date, end_date):
+        """
+        Instances overlapping start_date to end_date, which are aware datetimes
+        """
+        # Expand until an instance starts after the window or the series ends
+        if self._pending is not None and (not self.starts or self.starts[-1] <= end_date):
+            for dt in self._pending:
+                instance_start = local_to_utc(dt, self.zone_name)
+                instance_end = instance_start + self.duration
+                self.instances.append({
+                    'start': utc_isoformat(instance_start),
+                    'end': utc_isoformat(instance_end)
+                })
+                self.starts.append(instance_start)
+                self.ends.append(instance_end)
+                if instance_start > end_date:
+                    break
+            else:
+                self._pending = None
+
+        # Keep instances that overlap the window, not only those starting in it
+        lo = bisect_right(self.ends, start_date)
+        hi = bisect_right(self.starts, end_date)
+        return self.instances[lo:hi]
+
+class BookingIndex:
+    """
+    Bookings kept sorted by start time, and by name, so listings never sort
+    the full history. Entries are keyed by (start, id) and (name, start, id)
+    with the name lower-cased; bookings must carry the ID the store gave them.
+    Recurring series are also kept sorted by the UTC instant they run until,
+    so series that ended before a window are skipped by bisection.
+    """
+    def __init__(self, bookings=()):
+        self._bookings = {booking['id']: booking for booking in bookings}
+        self._by_start = sorted(self._start_key(b) for b in self._bookings.values())
+        self._by_name = sorted(self._name_key(b) for b in self._bookings.values())
+        recurring = [b for b in self._bookings.values() if b['recurrence']]
+        self._recurring_by_until = sorted(self._until_key(b) for b in recurring)
+        self._recurring_by_name = sorted(self._name_until_key(b) for b in recurring)
+
+    @staticmethod
+    def _start_key(booking):
+        return (booking['start'], booking['id'])
+
+    @staticmethod
+    def _name_key(booking):
+        return (booking['name'].lower(), booking['start'], booking['id'])
+
+    @staticmethod
+    def _until(booking):
+        until = datetime.fromisoformat(booking['recurrence']['until'])
+        return local_to_utc(until, booking.get('timezone', DEFAULT_TIMEZONE)).isoformat()
+
+    @classmethod
+    def _until_key(cls, booking):
+        return (cls._until(booking), booking['start'], booking['id'])
+
+    @classmethod
+    def _name_until_key(cls, booking):
+        return (booking['name'].lower(), cls._until(booking), booking['start'], booking['id'])
+
+    def __len__(self):
+        return len(self._bookings)
+
+    def _keys(self, booking):
+        keys = [(self._by_start, self._start_key(booking)), (self._by_name, self._name_key(booking))]
+        if booking['recurrence']:
+            keys += [(self._recurring_by_until, self._until_key(booking)),
+                     (self._recurring_by_name, self._name_until_key(booking))]
+        return keys
+
+    def add(self, booking):
+        """
+        Insert a booking at its sorted positions
+        """
+        self._bookings[booking['id']] = booking
+        for keys, key in self._keys(booking):
+            insort(keys, key)
+
+    def remove(self, booking):
+        """
+        Remove the booking with the same ID as the given one
+        """
+        if self._bookings.pop(booking['id'], None) is None:
+            return
+        for keys, key in self._keys(booking):
+            pos = bisect_left(keys, key)
+            if pos < len(keys) and keys[pos] == key:
+                del keys[pos]
+
+    def update(self, changes):
+        """
+        Apply (booking_id, before, after) changes from the booking store
+        """
+        for _, before, after in changes:
+            if before is not None:
+                self.remove(before)
+            if after is not None:
+                self.add(after)
+
+    def window(self, start_date=None, end_date=None, name_prefix=None, cursor=None, limit=PAGE_SIZE):
+        """
+        Return one page of bookings in [start_date, end_date) and the cursor
+        for the next page (None when there are no more). The bounds are aware
+        datetimes. A booking is in the window if it starts there, or if it is
+        a recurring series that started earlier and runs until start_date or
+        later. The cursor is the key of the last booking shown, so pages stay
+        in place when bookings are added or removed in between.
+
+        Without a name prefix, pages are in start order and cost
+        O(log n + page). With one, pages are in name order, then start order,
+        and each distinct matching name costs one more bisection. Series that
+        started before the window are listed first; finding them costs one
+        bisection plus the series still running at start_date.
+        """
+        start_key = start_date.astimezone(UTC).isoformat() if start_date is not None else None
+        end_key = end_date.astimezone(UTC).isoformat() if end_date is not None else None
+        if name_prefix:
+            keys = self._name_keys(name_prefix.lower(), start_key, end_key, cursor)
+            cursor_key = self._name_key
+        else:
+            keys = self._start_keys(start_key, end_key, cursor)
+            cursor_key = self._start_key
+
+        page = []
+        for key in keys:
+            if len(page) == limit:
+                return page, cursor_key(page[-1])
+            page.append(self._bookings[key[-1]])
+        return page, None
+
+    @staticmethod
+    def _running_into(keys, lo, start_key, key_of, cursor, same_name=None):
+        """
+        Keys, sorted for paging, of series from keys[lo:] that started before
+        start_key and come after the cursor. keys[lo:] must hold only series
+        running until start_key or later.
+        """
+        found = []
+        for pos in range(lo, len(keys)):
+            entry = keys[pos]
+            if same_name is not None and entry[0] != same_name:
+                break
+            key = key_of(entry)
+            if entry[-2] < start_key and (cursor is None or key > cursor):
+                found.append(key)
+        return sorted(found)
+
+    def _start_keys(self, start_key, end_key, cursor):
+        if start_key is not None and (cursor is None or cursor < (start_key,)):
+            recurring = self._recurring_by_until
+            yield from self._running_into(recurring, bisect_left(recurring, (start_key,)), start_key,
+                                          lambda entry: (entry[1], entry[2]), cursor)
+
+        keys = self._by_start
+        pos = 0 if start_key is None else bisect_left(keys, (start_key,))
+        if cursor is not None:
+            pos = max(pos, bisect_right(keys, cursor))
+        while pos < len(keys) and (end_key is None or keys[pos][0] < end_key):
+            yield keys[pos]
+            pos += 1
+
+    def _name_keys(self, prefix, start_key, end_key, cursor):
+        keys = self._by_name
+        pos = bisect_left(keys, (prefix,))
+        if cursor is not None:
+            pos = max(pos, bisect_right(keys, cursor))
+        while pos < len(keys) and keys[pos][0].startswith(prefix):
+            name = keys[pos][0]
+            if start_key is not None:
+                if cursor is None or cursor < (name, start_key):
+                    recurring = self._recurring_by_name
+                    yield from self._running_into(recurring, bisect_left(recurring, (name, start_key)), start_key,
+                                                  lambda entry: (entry[0], entry[2], entry[3]), cursor, name)
+                pos = max(pos, bisect_left(keys, (name, start_key)))
+            while pos < len(keys) and keys[pos][0] == name and (end_key is None or keys[pos][1] < end_key):
+                yield keys[pos]
+                pos += 1
+            # Jump to the next name
+            pos = bisect_left(keys, (name + '\0',))
 
 class BookingScheduler:
-    def __init__(self, storage_file='bookings.json'):
+    def __init__(self, storage_file='bookings.json', timezone=None, user=None):
         """
-        Initialize the booking scheduler with a storage file
+        Initialize the booking scheduler with a storage file. Dates typed in
+        and calendar views use the given zone, or the system's zone; changes
+        are logged as user.
         """
         self.storage_file = storage_file
-        self.bookings = self.load_bookings()
+        self.timezone = timezone or system_timezone()
+        if user is None:
+            try:
+                user = getpass.getuser()
+            except OSError:
+                user = 'unknown'
+        self.user = user
+        self.audit_file = os.path.splitext(storage_file)[0] + '_audit.jsonl'
+        bookings, version = self.load_bookings()
+        self.store = BookingStore(bookings, version, self.audit_file)
+        if version is None:
+            # Record the version of old files now, so later changes replay
+            # against this state even if the session ends without saving
+            self.save_bookings()
+        self.index = BookingIndex(self.bookings)
+        # Lazily expanded recurring series, by booking ID
+        self._series = {}
         init(autoreset=True)  # Initialize colorama for colored output
 
     def load_bookings(self):
         """
-        Load existing bookings from a JSON file
+        Load existing bookings from a JSON file. Returns the bookings and the
+        version they were saved at, None for files from before versions, or
+        version 0 with no bookings when there is no file yet, so changes in
+        the audit file are replayed from empty.
         """
         if os.path.exists(self.storage_file):
             with open(self.storage_file, 'r') as f:
-                bookings = json.load(f)
+                data = json.load(f)
+                if isinstance(data, list):
+                    bookings, version = data, None
+                else:
+                    bookings, version = data['bookings'], data['version']
                 # Convert old format bookings to new format if necessary
                 for booking in bookings:
                     if 'recurrence' not in booking:
                         booking['recurrence'] = None
-                return bookings
-        return []
+                    # Old bookings hold naive wall times; store them as UTC instants
+                    if 'timezone' not in booking:
+                        booking['timezone'] = DEFAULT_TIMEZONE
+                        for key in ('start', 'end'):
+                            wall = datetime.fromisoformat(booking[key])
+                            booking[key] = local_to_utc(wall, DEFAULT_TIMEZONE).isoformat()
+                return bookings, version
+        return [], 0
+
+    @property
+    def bookings(self):
+        """
+        Snapshot of the current bookings
+        """
+        return self.store.current()
+
+    def snapshot(self, when=None):
+        """
+        Return the bookings as they were at the aware datetime when, or the
+        current ones. Snapshots never change, so reports can keep reading one
+        while bookings are added, edited or undone. Raises ValueError for
+        times before the audit log starts.
+        """
+        if when is None:
+            return self.store.current()
+        return self.store.as_of(when)
 
     def save_bookings(self):
         """
-        Save bookings to a JSON file
+        Save a checkpoint of the current bookings to a JSON file. Each change
+        is already appended to the audit file as it happens, and changes after
+        the last checkpoint are replayed from it on load, so this only needs
+        to run on exit rather than after every change.
         """
         with open(self.storage_file, 'w') as f:
-            json.dump(self.bookings, f, indent=2)
+            json.dump({
+                'version': self.bookings.version,
+                'bookings': list(self.bookings)
+            }, f, indent=2)
+
+    def set_timezone(self, zone_name):
+        """
+        Change the zone used for dates typed in and for calendar views
+        """
+        try:
+            get_zone(zone_name)
+        except (ZoneInfoNotFoundError, ValueError):
+            print(Fore.RED + f"Unknown time zone: {zone_name}")
+            return False
+        self.timezone = zone_name
+        print(Fore.GREEN + f"Times are now shown in {zone_name}")
+        return True
 
     def parse_datetime(self, date_str, time_str):
         """
@@ -49,47 +411,38 @@ class BookingScheduler:
 
     def get_recurrence_instances(self, booking, start_date, end_date):
         """
-        Get all instances of a recurring booking between start_date and end_date
+        Get all instances of a recurring booking between start_date and end_date.
+        The bounds are aware datetimes and instances are returned in UTC. The
+        series repeats at the same wall-clock time in the booking's zone, so it
+        keeps its local time across DST changes.
         """
-        if not booking['recurrence']:
-            return [{'start': booking['start'], 'end': booking['end']}]
-
-        start = datetime.fromisoformat(booking['start'])
-        end = datetime.fromisoformat(booking['end'])
-        duration = end - start
-
-        recur_type = booking['recurrence']['type']
-        until = datetime.fromisoformat(booking['recurrence']['until'])
-        
-        if recur_type == 'weekly':
-            freq = WEEKLY
-        elif recur_type == 'monthly':
-            freq = MONTHLY
-        elif recur_type == 'yearly':
-            freq = YEARLY
-        else:
+        recurrence = booking['recurrence']
+        if not recurrence or recurrence['type'] not in FREQUENCIES:
             return [{'start': booking['start'], 'end': booking['end']}]
 
-        instances = []
-        for dt in rrule(freq=freq, dtstart=start, until=min(until, end_date)):
-            if dt >= start_date:
-                instance_end = dt + duration
-                instances.append({
-                    'start': dt.isoformat(),
-                    'end': instance_end.isoformat()
-                })
-
-        return instances
+        # Series are kept per booking ID; a booking read from an older
+        # snapshot may differ from the one cached, so check the key too
+        series = self._series.get(booking.get('id'))
+        if series is None or series.key != RecurringSeries.key_of(booking):
+            series = RecurringSeries(booking)
+            if 'id' in booking:
+                self._series[booking['id']] = series
+        return series.between(start_date, end_date)
 
-    def check_conflicts(self, new_start, new_end, recurrence=None):
+    def check_conflicts(self, new_start, new_end, recurrence=None, timezone=None, ignore_id=None):
         """
-        Check for scheduling conflicts, including recurring bookings
+        Check for scheduling conflicts, including recurring bookings.
+        new_start and new_end are aware datetimes; the recurrence until date is
+        read in the given zone. The booking with ignore_id is skipped.
         """
         check_until = new_end
         if recurrence:
-            check_until = datetime.fromisoformat(recurrence['until'])
+            check_until = local_to_utc(datetime.fromisoformat(recurrence['until']),
+                                       timezone or self.timezone)
 
         for booking in self.bookings:
+            if ignore_id is not None and booking['id'] == ignore_id:
+                continue
             # Get all instances of the existing booking up to our check_until date
             existing_instances = self.get_recurrence_instances(
                 booking,
@@ -106,24 +459,72 @@ class BookingScheduler:
 
         return None
 
-    def add_booking(self, name, date, start_time, end_time=None, duration=60, recurrence=None):
+    def apply_changes(self, changes, action):
+        """
+        Apply (booking_id, booking) pairs as one undoable change, as
+        BookingStore.apply does, and keep the index in step. Returns the
+        (booking_id, before, after) changes made.
+        """
+        applied = self.store.apply(changes, self.user, action)
+        self._changed(applied)
+        return applied
+
+    def undo_changes(self):
+        """
+        Undo the last change without printing. Returns the reverting changes,
+        or None if there is nothing to undo.
+        """
+        changes = self.store.undo(self.user)
+        if changes is not None:
+            self._changed(changes)
+        return changes
+
+    def redo_changes(self):
+        """
+        Redo the last undone change without printing. Returns the changes, or
+        None if there is nothing to redo.
+        """
+        changes = self.store.redo(self.user)
+        if changes is not None:
+            self._changed(changes)
+        return changes
+
+    def _changed(self, changes):
+        """
+        Update the index and drop the expanded series of changed bookings
+        """
+        self.index.update(changes)
+        for booking_id, _, _ in changes:
+            self._series.pop(booking_id, None)
+
+    def add_booking(self, name, date, start_time, end_time=None, duration=60, recurrence=None, timezone=None):
         """
-        Add a new booking with optional recurrence
+        Add a new booking with optional recurrence. Date and times are wall-clock
+        times in the given zone, or the scheduler's zone if none is given.
         """
-        start = self.parse_datetime(date, start_time)
-        if not start:
+        zone_name = timezone or self.timezone
+        try:
+            get_zone(zone_name)
+        except (ZoneInfoNotFoundError, ValueError):
+            print(Fore.RED + f"Unknown time zone: {zone_name}")
+            return False
+
+        local_start = self.parse_datetime(date, start_time)
+        if not local_start:
             return False
+        start = local_to_utc(local_start, zone_name)
 
         # If end time not provided, calculate based on duration
         if not end_time:
             end = start + timedelta(minutes=int(duration))
         else:
-            end = self.parse_datetime(date, end_time)
-            if not end:
+            local_end = self.parse_datetime(date, end_time)
+            if not local_end:
                 return False
+            end = local_to_utc(local_end, zone_name)
 
         # For recurring bookings, check conflicts up to the until date
-        conflict = self.check_conflicts(start, end, recurrence)
+        conflict = self.check_conflicts(start, end, recurrence, zone_name)
         if conflict:
             print(Fore.RED + "Conflict detected with existing booking:")
             if conflict.get('recurrence'):
@@ -137,46 +538,163 @@ class BookingScheduler:
             'name': name,
             'start': start.isoformat(),
             'end': end.isoformat(),
+            'timezone': zone_name,
             'recurrence': recurrence
         }
-        self.bookings.append(booking)
-        self.save_bookings()
-        
+        self.apply_changes([(None, booking)], 'add')
+
         print(Fore.GREEN + f"Booking added: {name}")
         if recurrence:
             print(Fore.GREEN + f"Recurring {recurrence['type']} until {recurrence['until']}")
         return True
 
-    def list_bookings(self):
+    def edit_booking(self, booking_id, name=None, date=None, start_time=None, duration=None):
         """
-        List all current bookings
+        Rename or reschedule a booking. Date and time are wall-clock times in
+        the booking's own zone; anything not given is kept.
         """
-        if not self.bookings:
-            print(Fore.YELLOW + "No bookings found.")
+        booking = self.bookings.get(booking_id)
+        if booking is None:
+            print(Fore.RED + f"No booking with ID {booking_id}")
+            return False
+
+        zone_name = booking.get('timezone', DEFAULT_TIMEZONE)
+        start = datetime.fromisoformat(booking['start'])
+        end = datetime.fromisoformat(booking['end'])
+        local_start = utc_to_local(start, zone_name)
+
+        if date or start_time:
+            local_start = self.parse_datetime(date or local_start.strftime('%Y-%m-%d'),
+                                              start_time or local_start.strftime('%H:%M'))
+            if not local_start:
+                return False
+        new_start = local_to_utc(local_start, zone_name)
+        if duration:
+            new_end = new_start + timedelta(minutes=int(duration))
+        else:
+            new_end = new_start + (end - start)
+
+        conflict = self.check_conflicts(new_start, new_end, booking['recurrence'], zone_name, booking_id)
+        if conflict:
+            print(Fore.RED + f"Conflict detected with existing booking: {conflict['name']}")
+            return False
+
+        edited = dict(booking,
+                      name=name or booking['name'],
+                      start=new_start.isoformat(),
+                      end=new_end.isoformat())
+        self.apply_changes([(booking_id, edited)], 'edit')
+
+        print(Fore.GREEN + f"Booking updated: {edited['name']}")
+        return True
+
+    def delete_booking(self, booking_id):
+        """
+        Delete a booking. It can be restored with undo.
+        """
+        booking = self.bookings.get(booking_id)
+        if booking is None:
+            print(Fore.RED + f"No booking with ID {booking_id}")
+            return False
+
+        self.apply_changes([(booking_id, None)], 'delete')
+
+        print(Fore.GREEN + f"Booking deleted: {booking['name']}")
+        return True
+
+    def undo(self):
+        """
+        Undo the last change
+        """
+        changes = self.undo_changes()
+        if changes is None:
+            print(Fore.YELLOW + "Nothing to undo.")
+            return False
+
+        print(Fore.GREEN + f"Undid {len(changes)} change(s)")
+        return True
+
+    def redo(self):
+        """
+        Redo the last undone change
+        """
+        changes = self.redo_changes()
+        if changes is None:
+            print(Fore.YELLOW + "Nothing to redo.")
+            return False
+
+        print(Fore.GREEN + f"Redid {len(changes)} change(s)")
+        return True
+
+    def show_audit_log(self, limit=PAGE_SIZE):
+        """
+        Show the most recent changes, newest first
+        """
+        entries = self.store.audit_log[-limit:]
+        if not entries:
+            print(Fore.YELLOW + "No changes recorded.")
             return
 
+        table_data = []
+        for entry in reversed(entries):
+            summary = []
+            for change in entry['changes']:
+                if change['before'] is None:
+                    summary.append(f"+{change['after']['name']}")
+                elif change['after'] is None:
+                    summary.append(f"-{change['before']['name']}")
+                else:
+                    summary.append(f"~{change['after']['name']}")
+            when = utc_to_local(datetime.fromisoformat(entry['timestamp']), self.timezone)
+            table_data.append([
+                when.strftime('%Y-%m-%d %H:%M:%S'),
+                entry['user'],
+                entry['action'],
+                entry['version'],
+                ", ".join(summary)
+            ])
+
+        print(Fore.CYAN + tabulate(table_data,
+            headers=['Time', 'User', 'Action', 'Version', 'Changes'],
+            tablefmt='pretty'))
+
+    def list_bookings(self, start_date=None, end_date=None, name_prefix=None, cursor=None, page_size=PAGE_SIZE):
+        """
+        List one page of bookings, optionally filtered by date range and name
+        prefix (see BookingIndex.window). Times are shown in each booking's own
+        zone. Returns the cursor for the next page, or None.
+        """
+        page, next_cursor = self.index.window(start_date, end_date, name_prefix, cursor, page_size)
+        if not page:
+            print(Fore.YELLOW + "No bookings found.")
+            return None
+
         # Prepare bookings for tabulate
         table_data = []
-        for booking in self.bookings:
+        for booking in page:
             recur_info = ""
             if booking['recurrence']:
                 recur_info = f"[{booking['recurrence']['type']} until {booking['recurrence']['until']}]"
             
+            zone_name = booking.get('timezone', DEFAULT_TIMEZONE)
             table_data.append([
+                booking['id'],
                 booking['name'],
-                datetime.fromisoformat(booking['start']).strftime('%Y-%m-%d %H:%M'),
-                datetime.fromisoformat(booking['end']).strftime('%Y-%m-%d %H:%M'),
+                utc_to_local(datetime.fromisoformat(booking['start']), zone_name).strftime('%Y-%m-%d %H:%M'),
+                utc_to_local(datetime.fromisoformat(booking['end']), zone_name).strftime('%Y-%m-%d %H:%M'),
+                zone_name,
                 recur_info
             ])
 
         # Print table
         print(Fore.CYAN + tabulate(table_data,
-            headers=['Name', 'Start', 'End', 'Recurrence'],
+            headers=['ID', 'Name', 'Start', 'End', 'Zone', 'Recurrence'],
             tablefmt='pretty'))
+        return next_cursor
 
     def show_calendar(self, year=None, month=None):
         """
-        Display a calendar view with bookings
+        Display a calendar view with bookings, in the scheduler's zone
         """
         if year is None or month is None:
             today = date.today()
@@ -184,11 +702,11 @@ class BookingScheduler:
             month = today.month
 
         # Calculate start and end of month
-        start_date = datetime(year, month, 1)
+        start_date = local_to_utc(datetime(year, month, 1), self.timezone)
         if month == 12:
-            end_date = datetime(year + 1, 1, 1)
+            end_date = local_to_utc(datetime(year + 1, 1, 1), self.timezone)
         else:
-            end_date = datetime(year, month + 1, 1)
+            end_date = local_to_utc(datetime(year, month + 1, 1), self.timezone)
 
         # Get calendar for the specified month
         cal = calendar.monthcalendar(year, month)
@@ -198,7 +716,7 @@ class BookingScheduler:
         for booking in self.bookings:
             instances = self.get_recurrence_instances(booking, start_date, end_date)
             for instance in instances:
-                booking_date = datetime.fromisoformat(instance['start']).date()
+                booking_date = utc_to_local(datetime.fromisoformat(instance['start']), self.timezone).date()
                 if booking_date.year == year and booking_date.month == month:
                     if booking_date.day not in bookings_by_day:
                         bookings_by_day[booking_date.day] = []
@@ -212,6 +730,7 @@ class BookingScheduler:
         # Print calendar header
         month_name = calendar.month_name[month]
         print(Fore.CYAN + f"\n{month_name} {year}".center(34))
+        print(Fore.WHITE + f"({self.timezone})".center(34))
         print(Fore.WHITE + "Mo Tu We Th Fr Sa Su".center(34))
 
         # Print calendar days
@@ -231,16 +750,18 @@ class BookingScheduler:
 
     def show_day_bookings(self, year, month, day):
         """
-        Show all bookings for a specific day, including recurring instances
+        Show all bookings for a specific day, including recurring instances,
+        in the scheduler's zone
         """
         target_date = datetime(year, month, day)
-        end_date = target_date + timedelta(days=1)
+        start_date = local_to_utc(target_date, self.timezone)
+        end_date = local_to_utc(target_date + timedelta(days=1), self.timezone)
         day_bookings = []
 
         for booking in self.bookings:
-            instances = self.get_recurrence_instances(booking, target_date, end_date)
+            instances = self.get_recurrence_instances(booking, start_date, end_date)
             for instance in instances:
-                instance_date = datetime.fromisoformat(instance['start']).date()
+                instance_date = utc_to_local(datetime.fromisoformat(instance['start']), self.timezone).date()
                 if instance_date == target_date.date():
                     day_bookings.append({
                         'name': booking['name'],
@@ -250,7 +771,7 @@ class BookingScheduler:
                     })
 
         if not day_bookings:
-            print(Fore.YELLOW + f"No bookings found for {target_date.date()}")
+            print(Fore.YELLOW + f"No bookings found for {target_date.date()} ({self.timezone})")
             return
 
         # Sort bookings by start time
@@ -259,8 +780,8 @@ class BookingScheduler:
         # Prepare table data
         table_data = []
         for booking in day_bookings:
-            start_time = datetime.fromisoformat(booking['start'])
-            end_time = datetime.fromisoformat(booking['end'])
+            start_time = utc_to_local(datetime.fromisoformat(booking['start']), self.timezone)
+            end_time = utc_to_local(datetime.fromisoformat(booking['end']), self.timezone)
             recur_info = ""
             if booking.get('recurrence'):
                 recur_info = f"[{booking['recurrence']['type']}]"
@@ -272,7 +793,7 @@ class BookingScheduler:
                 recur_info
             ])
 
-        print(Fore.CYAN + f"\nBookings for {target_date.date()}")
+        print(Fore.CYAN + f"\nBookings for {target_date.date()} ({self.timezone})")
         print(tabulate(table_data, 
             headers=['Name', 'Start', 'End', 'Recurrence'],
             tablefmt='pretty'))
@@ -281,20 +802,27 @@ def main():
     scheduler = BookingScheduler()
 
     while True:
-        print("\n--- Booking Scheduler ---")
+        print(f"\n--- Booking Scheduler ({scheduler.timezone}) ---")
         print("1. Add Booking")
-        print("2. List All Bookings")
+        print("2. List Bookings")
         print("3. Show Calendar")
         print("4. View Day's Bookings")
-        print("5. Exit")
+        print("5. Edit Booking")
+        print("6. Delete Booking")
+        print("7. Undo")
+        print("8. Redo")
+        print("9. Show Change History")
+        print("10. Set Time Zone")
+        print("11. Exit")
         
-        choice = input("Enter your choice (1-5): ")
+        choice = input("Enter your choice (1-11): ")
 
         if choice == '1':
             name = input("Enter booking name: ")
             date = input("Enter date (YYYY-MM-DD): ")
             start_time = input("Enter start time (HH:MM): ")
             duration = input("Enter duration in minutes (default 60): ") or 60
+            zone_name = input(f"Enter time zone (default {scheduler.timezone}): ") or None
             
             # Ask about recurrence
             recur = input("Make this a recurring booking? (y/n): ").lower()
@@ -327,10 +855,24 @@ def main():
                     print(Fore.RED + "Invalid recurrence type selected")
                     continue
             
-            scheduler.add_booking(name, date, start_time, duration=int(duration), recurrence=recurrence)
+            scheduler.add_booking(name, date, start_time, duration=int(duration), recurrence=recurrence, timezone=zone_name)
 
         elif choice == '2':
-            scheduler.list_bookings()
+            from_date = input("From date (YYYY-MM-DD, press Enter for all): ")
+            to_date = input("To date (YYYY-MM-DD, press Enter for all): ")
+            name_prefix = input("Name starts with (press Enter for all): ") or None
+            try:
+                start_date = local_to_utc(datetime.strptime(from_date, "%Y-%m-%d"), scheduler.timezone) if from_date else None
+                end_date = local_to_utc(datetime.strptime(to_date, "%Y-%m-%d") + timedelta(days=1), scheduler.timezone) if to_date else None
+            except ValueError:
+                print(Fore.RED + "Invalid date format. Use YYYY-MM-DD")
+                continue
+
+            cursor = scheduler.list_bookings(start_date, end_date, name_prefix)
+            while cursor is not None:
+                if input("Press Enter for next page, q to stop: ").lower() == 'q':
+                    break
+                cursor = scheduler.list_bookings(start_date, end_date, name_prefix, cursor)
 
         elif choice == '3':
             year = input("Enter year (press Enter for current): ") or datetime.now().year
@@ -347,6 +889,42 @@ def main():
                 print(Fore.RED + "Day is required")
 
         elif choice == '5':
+            booking_id = input("Enter booking ID: ")
+            if not booking_id.isdigit():
+                print(Fore.RED + "Booking ID must be a number")
+                continue
+            name = input("Enter new name (press Enter to keep): ") or None
+            date = input("Enter new date (YYYY-MM-DD, press Enter to keep): ") or None
+            start_time = input("Enter new start time (HH:MM, press Enter to keep): ") or None
+            duration = input("Enter new duration in minutes (press Enter to keep): ") or None
+            if duration is not None and not duration.isdigit():
+                print(Fore.RED + "Duration must be a number of minutes")
+                continue
+            scheduler.edit_booking(int(booking_id), name, date, start_time, duration)
+
+        elif choice == '6':
+            booking_id = input("Enter booking ID: ")
+            if not booking_id.isdigit():
+                print(Fore.RED + "Booking ID must be a number")
+                continue
+            scheduler.delete_booking(int(booking_id))
+
+        elif choice == '7':
+            scheduler.undo()
+
+        elif choice == '8':
+            scheduler.redo()
+
+        elif choice == '9':
+            scheduler.show_audit_log()
+
+        elif choice == '10':
+            zone_name = input(f"Enter time zone (current {scheduler.timezone}): ")
+            if zone_name:
+                scheduler.set_timezone(zone_name)
+
+        elif choice == '11':
+            scheduler.save_bookings()
             break
 
         else:
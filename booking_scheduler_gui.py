@@ -1,13 +1,13 @@
 import customtkinter as ctk
 from tkcalendar import Calendar
 from datetime import datetime, timedelta, date
-from dateutil.rrule import rrule, WEEKLY, MONTHLY, YEARLY
 from dateutil.relativedelta import relativedelta
-import json
-import os
 import calendar
 import tkinter as tk
 from tkinter import ttk
+from booking_manager import (BookingScheduler, PAGE_SIZE, DEFAULT_TIMEZONE,
+                             get_zone, local_to_utc, utc_to_local)
+from zoneinfo import ZoneInfoNotFoundError
 
 class BookingSchedulerGUI(ctk.CTk):
     def __init__(self):
@@ -19,9 +19,13 @@ class BookingSchedulerGUI(ctk.CTk):
         ctk.set_appearance_mode("dark")
         ctk.set_default_color_theme("blue")
 
-        # Initialize booking storage
-        self.storage_file = 'bookings.json'
-        self.bookings = self.load_bookings()
+        # Initialize booking storage; the scheduler's zone is the view zone
+        self.scheduler = BookingScheduler('bookings.json')
+        # Cursors of the pages shown so far; the last one is the current page
+        self.page_cursors = [None]
+        self.next_cursor = None
+        # (start_date, end_date, name_prefix) applied with the Filter button
+        self.list_filters = (None, None, None)
 
         # Create main layout frames
         self.create_layout()
@@ -35,6 +39,9 @@ class BookingSchedulerGUI(ctk.CTk):
         self.update_bookings_list()
         self.update_calendar()
 
+        # Changes are journaled as they happen; checkpoint on close
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+
     def create_layout(self):
         # Create main frames
         self.calendar_frame = ctk.CTkFrame(self)
@@ -72,6 +79,17 @@ class BookingSchedulerGUI(ctk.CTk):
         self.cal.pack(padx=10, pady=5)
         self.cal.bind("<<CalendarSelected>>", self.on_date_select)
 
+        # Zone the calendar and date filters are shown in
+        view_zone_frame = ctk.CTkFrame(self.calendar_frame)
+        view_zone_frame.pack(pady=5)
+        view_zone_label = ctk.CTkLabel(view_zone_frame, text="Times shown in:")
+        view_zone_label.pack(side="left", padx=5)
+        self.view_zone_var = ctk.StringVar(value=self.scheduler.timezone)
+        self.view_zone_entry = ctk.CTkEntry(view_zone_frame, textvariable=self.view_zone_var, width=140)
+        self.view_zone_entry.pack(side="left", padx=5)
+        self.view_zone_button = ctk.CTkButton(view_zone_frame, text="Set", width=50, command=self.on_view_zone_change)
+        self.view_zone_button.pack(side="left", padx=5)
+
     def create_booking_frame(self):
         # Booking form label
         booking_label = ctk.CTkLabel(self.booking_frame, text="Add Booking", font=("Arial", 16, "bold"))
@@ -112,6 +130,13 @@ class BookingSchedulerGUI(ctk.CTk):
         self.duration_menu = ctk.CTkOptionMenu(self.booking_frame, variable=self.duration_var, values=durations)
         self.duration_menu.pack(pady=2)
 
+        # Time zone entry
+        timezone_label = ctk.CTkLabel(self.booking_frame, text="Time zone:")
+        timezone_label.pack(pady=2)
+        self.timezone_var = ctk.StringVar(value=self.scheduler.timezone)
+        self.timezone_entry = ctk.CTkEntry(self.booking_frame, textvariable=self.timezone_var)
+        self.timezone_entry.pack(pady=2)
+
         # Recurrence options
         recurrence_label = ctk.CTkLabel(self.booking_frame, text="Recurrence:")
         recurrence_label.pack(pady=2)
@@ -144,75 +169,59 @@ class BookingSchedulerGUI(ctk.CTk):
         list_label = ctk.CTkLabel(self.list_frame, text="Current Bookings", font=("Arial", 16, "bold"))
         list_label.pack(pady=5)
 
+        # Filter controls
+        filter_frame = ctk.CTkFrame(self.list_frame)
+        filter_frame.pack(pady=2)
+
+        from_label = ctk.CTkLabel(filter_frame, text="From:")
+        from_label.pack(side="left", padx=5)
+        self.from_var = ctk.StringVar()
+        self.from_entry = ctk.CTkEntry(filter_frame, textvariable=self.from_var, width=100, placeholder_text="YYYY-MM-DD")
+        self.from_entry.pack(side="left", padx=5)
+
+        to_label = ctk.CTkLabel(filter_frame, text="To:")
+        to_label.pack(side="left", padx=5)
+        self.to_var = ctk.StringVar()
+        self.to_entry = ctk.CTkEntry(filter_frame, textvariable=self.to_var, width=100, placeholder_text="YYYY-MM-DD")
+        self.to_entry.pack(side="left", padx=5)
+
+        prefix_label = ctk.CTkLabel(filter_frame, text="Name starts with:")
+        prefix_label.pack(side="left", padx=5)
+        self.prefix_var = ctk.StringVar()
+        self.prefix_entry = ctk.CTkEntry(filter_frame, textvariable=self.prefix_var, width=120)
+        self.prefix_entry.pack(side="left", padx=5)
+
+        self.filter_button = ctk.CTkButton(filter_frame, text="Filter", width=70, command=self.on_filter_change)
+        self.filter_button.pack(side="left", padx=5)
+
         # Create textbox for bookings
         self.bookings_text = ctk.CTkTextbox(self.list_frame, height=200)
         self.bookings_text.pack(padx=10, pady=5, fill="both", expand=True)
 
-    def load_bookings(self):
-        if os.path.exists(self.storage_file):
-            with open(self.storage_file, 'r') as f:
-                bookings = json.load(f)
-                for booking in bookings:
-                    if 'recurrence' not in booking:
-                        booking['recurrence'] = None
-                return bookings
-        return []
-
-    def save_bookings(self):
-        with open(self.storage_file, 'w') as f:
-            json.dump(self.bookings, f, indent=2)
-
-    def get_recurrence_instances(self, booking, start_date, end_date):
-        if not booking['recurrence']:
-            return [{'start': booking['start'], 'end': booking['end']}]
-
-        start = datetime.fromisoformat(booking['start'])
-        end = datetime.fromisoformat(booking['end'])
-        duration = end - start
-
-        recur_type = booking['recurrence']['type']
-        until = datetime.fromisoformat(booking['recurrence']['until'])
-        
-        if recur_type == 'weekly':
-            freq = WEEKLY
-        elif recur_type == 'monthly':
-            freq = MONTHLY
-        elif recur_type == 'yearly':
-            freq = YEARLY
-        else:
-            return [{'start': booking['start'], 'end': booking['end']}]
-
-        instances = []
-        for dt in rrule(freq=freq, dtstart=start, until=min(until, end_date)):
-            if dt >= start_date:
-                instance_end = dt + duration
-                instances.append({
-                    'start': dt.isoformat(),
-                    'end': instance_end.isoformat()
-                })
-
-        return instances
-
-    def check_conflicts(self, new_start, new_end, recurrence=None):
-        check_until = new_end
-        if recurrence:
-            check_until = datetime.fromisoformat(recurrence['until'])
-
-        for booking in self.bookings:
-            existing_instances = self.get_recurrence_instances(
-                booking,
-                new_start,
-                check_until
-            )
-
-            for instance in existing_instances:
-                existing_start = datetime.fromisoformat(instance['start'])
-                existing_end = datetime.fromisoformat(instance['end'])
-                
-                if (new_start < existing_end and new_end > existing_start):
-                    return booking
-
-        return None
+        # Paging controls
+        page_frame = ctk.CTkFrame(self.list_frame)
+        page_frame.pack(pady=2)
+        self.prev_button = ctk.CTkButton(page_frame, text="< Previous", width=90, command=self.on_prev_page)
+        self.prev_button.pack(side="left", padx=5)
+        self.page_label = ctk.CTkLabel(page_frame, text="Page 1")
+        self.page_label.pack(side="left", padx=5)
+        self.next_button = ctk.CTkButton(page_frame, text="Next >", width=90, command=self.on_next_page)
+        self.next_button.pack(side="left", padx=5)
+
+        # Delete and undo controls
+        actions_frame = ctk.CTkFrame(self.list_frame)
+        actions_frame.pack(pady=2)
+        delete_label = ctk.CTkLabel(actions_frame, text="Booking ID:")
+        delete_label.pack(side="left", padx=5)
+        self.delete_id_var = ctk.StringVar()
+        self.delete_id_entry = ctk.CTkEntry(actions_frame, textvariable=self.delete_id_var, width=60)
+        self.delete_id_entry.pack(side="left", padx=5)
+        self.delete_button = ctk.CTkButton(actions_frame, text="Delete", width=70, command=self.delete_booking)
+        self.delete_button.pack(side="left", padx=5)
+        self.undo_button = ctk.CTkButton(actions_frame, text="Undo", width=70, command=self.undo)
+        self.undo_button.pack(side="left", padx=5)
+        self.redo_button = ctk.CTkButton(actions_frame, text="Redo", width=70, command=self.redo)
+        self.redo_button.pack(side="left", padx=5)
 
     def add_booking(self):
         # Get booking details
@@ -225,9 +234,16 @@ class BookingSchedulerGUI(ctk.CTk):
         hour = self.hour_var.get()
         minute = self.minute_var.get()
         duration = int(self.duration_var.get())
+        zone_name = self.timezone_var.get().strip() or self.scheduler.timezone
+        try:
+            get_zone(zone_name)
+        except (ZoneInfoNotFoundError, ValueError):
+            self.show_status(f"Unknown time zone: {zone_name}", "error")
+            return
 
-        # Create datetime objects
-        start = datetime.strptime(f"{date_str} {hour}:{minute}", "%Y-%m-%d %H:%M")
+        # Create datetime objects; times are entered as wall-clock times in the zone
+        local_start = datetime.strptime(f"{date_str} {hour}:{minute}", "%Y-%m-%d %H:%M")
+        start = local_to_utc(local_start, zone_name)
         end = start + timedelta(minutes=duration)
 
         # Handle recurrence
@@ -241,7 +257,7 @@ class BookingSchedulerGUI(ctk.CTk):
             }
 
         # Check for conflicts
-        conflict = self.check_conflicts(start, end, recurrence)
+        conflict = self.scheduler.check_conflicts(start, end, recurrence, zone_name)
         if conflict:
             self.show_status(f"Conflict with existing booking: {conflict['name']}", "error")
             return
@@ -251,10 +267,10 @@ class BookingSchedulerGUI(ctk.CTk):
             'name': name,
             'start': start.isoformat(),
             'end': end.isoformat(),
+            'timezone': zone_name,
             'recurrence': recurrence
         }
-        self.bookings.append(booking)
-        self.save_bookings()
+        self.scheduler.apply_changes([(None, booking)], 'add')
 
         # Update UI
         self.show_status("Booking added successfully!", "success")
@@ -262,22 +278,45 @@ class BookingSchedulerGUI(ctk.CTk):
         self.update_bookings_list()
         self.update_calendar()
 
+    def get_list_filters(self):
+        # Returns None if a date is invalid
+        start_date = end_date = None
+        try:
+            if self.from_var.get().strip():
+                start_date = local_to_utc(datetime.strptime(self.from_var.get().strip(), "%Y-%m-%d"), self.scheduler.timezone)
+            if self.to_var.get().strip():
+                end_date = local_to_utc(datetime.strptime(self.to_var.get().strip(), "%Y-%m-%d") + timedelta(days=1), self.scheduler.timezone)
+        except ValueError:
+            self.show_status("Invalid filter date. Use YYYY-MM-DD", "error")
+            return None
+        name_prefix = self.prefix_var.get().strip() or None
+        return start_date, end_date, name_prefix
+
     def update_bookings_list(self):
         self.bookings_text.delete("1.0", "end")
-        if not self.bookings:
+
+        start_date, end_date, name_prefix = self.list_filters
+        page, self.next_cursor = self.scheduler.index.window(
+            start_date, end_date, name_prefix, self.page_cursors[-1], PAGE_SIZE
+        )
+
+        self.page_label.configure(text=f"Page {len(self.page_cursors)}")
+        self.prev_button.configure(state="normal" if len(self.page_cursors) > 1 else "disabled")
+        self.next_button.configure(state="normal" if self.next_cursor is not None else "disabled")
+
+        if not page:
             self.bookings_text.insert("1.0", "No bookings found.")
             return
 
-        # Sort bookings by start time
-        sorted_bookings = sorted(self.bookings, key=lambda x: x['start'])
-
-        for booking in sorted_bookings:
-            start = datetime.fromisoformat(booking['start'])
-            end = datetime.fromisoformat(booking['end'])
+        for booking in page:
+            zone_name = booking.get('timezone', DEFAULT_TIMEZONE)
+            start = utc_to_local(datetime.fromisoformat(booking['start']), zone_name)
+            end = utc_to_local(datetime.fromisoformat(booking['end']), zone_name)
             
-            booking_text = f"Name: {booking['name']}\n"
+            booking_text = f"ID: {booking['id']}\n"
+            booking_text += f"Name: {booking['name']}\n"
             booking_text += f"Date: {start.strftime('%Y-%m-%d')}\n"
-            booking_text += f"Time: {start.strftime('%H:%M')} - {end.strftime('%H:%M')}\n"
+            booking_text += f"Time: {start.strftime('%H:%M')} - {end.strftime('%H:%M')} ({zone_name})\n"
             
             if booking['recurrence']:
                 booking_text += f"Recurrence: {booking['recurrence']['type']} "
@@ -286,6 +325,61 @@ class BookingSchedulerGUI(ctk.CTk):
             booking_text += "-" * 40 + "\n"
             self.bookings_text.insert("end", booking_text)
 
+    def delete_booking(self):
+        booking_id = self.delete_id_var.get().strip()
+        booking = self.scheduler.bookings.get(int(booking_id)) if booking_id.isdigit() else None
+        if booking is None:
+            self.show_status(f"No booking with ID {booking_id}", "error")
+            return
+
+        self.scheduler.apply_changes([(booking['id'], None)], 'delete')
+
+        self.show_status(f"Booking deleted: {booking['name']}", "success")
+        self.delete_id_var.set("")
+        self.update_bookings_list()
+        self.update_calendar()
+
+    def undo(self):
+        changes = self.scheduler.undo_changes()
+        if changes is None:
+            self.show_status("Nothing to undo", "info")
+            return
+        self.show_status(f"Undid {len(changes)} change(s)", "success")
+        self.update_bookings_list()
+        self.update_calendar()
+
+    def redo(self):
+        changes = self.scheduler.redo_changes()
+        if changes is None:
+            self.show_status("Nothing to redo", "info")
+            return
+        self.show_status(f"Redid {len(changes)} change(s)", "success")
+        self.update_bookings_list()
+        self.update_calendar()
+
+    def on_close(self):
+        self.scheduler.save_bookings()
+        self.destroy()
+
+    def on_filter_change(self):
+        # Keep the current page if the filters are invalid
+        filters = self.get_list_filters()
+        if filters is None:
+            return
+        self.list_filters = filters
+        self.page_cursors = [None]
+        self.update_bookings_list()
+
+    def on_next_page(self):
+        if self.next_cursor is not None:
+            self.page_cursors.append(self.next_cursor)
+            self.update_bookings_list()
+
+    def on_prev_page(self):
+        if len(self.page_cursors) > 1:
+            self.page_cursors.pop()
+            self.update_bookings_list()
+
     def update_calendar(self):
         try:
             # Clear existing tags
@@ -300,17 +394,17 @@ class BookingSchedulerGUI(ctk.CTk):
             year = current_date.year
             month = current_date.month
             
-            start_date = datetime(year, month, 1)
+            start_date = local_to_utc(datetime(year, month, 1), self.scheduler.timezone)
             if month == 12:
-                end_date = datetime(year + 1, 1, 1)
+                end_date = local_to_utc(datetime(year + 1, 1, 1), self.scheduler.timezone)
             else:
-                end_date = datetime(year, month + 1, 1)
+                end_date = local_to_utc(datetime(year, month + 1, 1), self.scheduler.timezone)
 
             # Add events for all bookings
-            for booking in self.bookings:
-                instances = self.get_recurrence_instances(booking, start_date, end_date)
+            for booking in self.scheduler.bookings:
+                instances = self.scheduler.get_recurrence_instances(booking, start_date, end_date)
                 for instance in instances:
-                    event_date = datetime.fromisoformat(instance['start']).date()
+                    event_date = utc_to_local(datetime.fromisoformat(instance['start']), self.scheduler.timezone).date()
                     try:
                         self.cal.calevent_create(event_date, booking['name'], "booking")
                     except tk.TclError as e:
@@ -329,6 +423,20 @@ class BookingSchedulerGUI(ctk.CTk):
     def on_date_select(self, event=None):
         self.update_calendar()
 
+    def on_view_zone_change(self):
+        zone_name = self.view_zone_var.get().strip()
+        try:
+            get_zone(zone_name)
+        except (ZoneInfoNotFoundError, ValueError):
+            self.show_status(f"Unknown time zone: {zone_name}", "error")
+            self.view_zone_var.set(self.scheduler.timezone)
+            return
+        self.scheduler.timezone = zone_name
+        self.show_status(f"Times are now shown in {zone_name}", "success")
+        # Date filters are read in the view zone
+        self.on_filter_change()
+        self.update_calendar()
+
     def on_recurrence_change(self, choice):
         if choice == "none":
             self.until_frame.pack_forget()
@@ -0,0 +1,353 @@
+from datetime import datetime, timezone
+from bisect import bisect_right
+import json
+import os
+
+BRANCH_BITS = 5
+BRANCH = 1 << BRANCH_BITS
+MASK = BRANCH - 1
+
+def _assoc(node, level, i, value):
+    """
+    Return a copy of node with slot i set to value, copying only the path
+    down to the leaf. Setting the slot just past the end appends.
+    """
+    idx = (i >> level) & MASK
+    children = list(node)
+    if level == 0:
+        new_child = value
+    else:
+        child = node[idx] if idx < len(node) else ()
+        new_child = _assoc(child, level - BRANCH_BITS, i, value)
+    if idx == len(children):
+        children.append(new_child)
+    else:
+        children[idx] = new_child
+    return tuple(children)
+
+def _walk(node, level):
+    if level == 0:
+        yield from node
+    else:
+        for child in node:
+            yield from _walk(child, level - BRANCH_BITS)
+
+class PersistentVector:
+    """
+    Immutable vector stored as a 32-way tree of tuples. set and append return
+    a new vector that shares every untouched node with the old one, so a
+    change costs O(log n) instead of a full copy.
+    """
+    __slots__ = ('_count', '_shift', '_root')
+
+    def __init__(self, count=0, shift=0, root=()):
+        self._count = count
+        self._shift = shift
+        self._root = root
+
+    @classmethod
+    def from_iterable(cls, values):
+        """
+        Build a vector bottom-up in O(n)
+        """
+        level = [tuple(values)]
+        count = len(level[0])
+        level = [level[0][i:i + BRANCH] for i in range(0, count, BRANCH)] or [()]
+        shift = 0
+        while len(level) > 1:
+            level = [tuple(level[i:i + BRANCH]) for i in range(0, len(level), BRANCH)]
+            shift += BRANCH_BITS
+        return cls(count, shift, level[0])
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, i):
+        if not 0 <= i < self._count:
+            raise IndexError(i)
+        node = self._root
+        for level in range(self._shift, 0, -BRANCH_BITS):
+            node = node[(i >> level) & MASK]
+        return node[i & MASK]
+
+    def __iter__(self):
+        return _walk(self._root, self._shift)
+
+    def set(self, i, value):
+        if not 0 <= i < self._count:
+            raise IndexError(i)
+        return PersistentVector(self._count, self._shift, _assoc(self._root, self._shift, i, value))
+
+    def append(self, value):
+        root, shift = self._root, self._shift
+        # Grow a level when the tree is full
+        if self._count == 1 << (shift + BRANCH_BITS):
+            root, shift = (root,), shift + BRANCH_BITS
+        return PersistentVector(self._count + 1, shift, _assoc(root, shift, self._count, value))
+
+class Snapshot:
+    """
+    Read-only view of the bookings at one version. Booking IDs are slots in
+    the vector; deleted bookings leave an empty slot so IDs stay stable.
+    """
+    __slots__ = ('version', 'timestamp', '_slots', '_live')
+
+    def __init__(self, version, timestamp, slots, live):
+        self.version = version
+        self.timestamp = timestamp
+        self._slots = slots
+        self._live = live
+
+    def __len__(self):
+        return self._live
+
+    def __iter__(self):
+        return (booking for booking in self._slots if booking is not None)
+
+    def get(self, booking_id):
+        if 0 <= booking_id < len(self._slots):
+            return self._slots[booking_id]
+        return None
+
+def _put(slots, booking_id, booking):
+    """
+    Set a slot, growing the vector with empty slots if the ID is past its end
+    """
+    while len(slots) <= booking_id:
+        slots = slots.append(None)
+    return slots.set(booking_id, booking)
+
+def _changed(snapshot, version, timestamp, changes):
+    """
+    Return the snapshot after (booking_id, before, after) changes
+    """
+    slots, live = snapshot._slots, snapshot._live
+    for booking_id, before, after in changes:
+        slots = _put(slots, booking_id, after)
+        live += (after is not None) - (before is not None)
+    return Snapshot(version, timestamp, slots, live)
+
+def _replayed(snapshot, version, timestamp, changes):
+    """
+    Like _changed, but for changes read back from the audit file. Raises
+    ValueError if a change's before does not match the slot it replaces.
+    """
+    for booking_id, before, after in changes:
+        if snapshot.get(booking_id) != before:
+            raise ValueError(f"Audit log does not match booking {booking_id} at version {version}")
+    return _changed(snapshot, version, timestamp, changes)
+
+def _reverted(changes):
+    return [(booking_id, after, before) for booking_id, before, after in reversed(changes)]
+
+def _read_audit_file(path):
+    entries = []
+    if path and os.path.exists(path):
+        with open(path, 'r') as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # A line cut short by a crash; the change never took effect
+                    continue
+    return entries
+
+class BookingStore:
+    """
+    Versioned booking store. Every change makes a new snapshot that shares
+    structure with the previous one, so undo, redo and reads of old versions
+    never copy the whole booking list.
+
+    Each change is recorded in an audit log and appended to audit_file as one
+    JSON line, which costs only the size of the change. On start the audit
+    file is replayed from the checkpoint (the bookings saved at version), so
+    IDs, version numbers, undo, redo and point-in-time reads carry over from
+    earlier sessions, including changes made after the last checkpoint.
+    """
+    def __init__(self, bookings=(), version=None, audit_file=None):
+        self.audit_file = audit_file
+        self.audit_log = _read_audit_file(audit_file)
+
+        # Rebuild the version tree and the undo/redo chain from the log
+        parents = {}
+        changes_by_version = {}
+        timestamps = {}
+        chain, pos = [], 0
+        for entry in self.audit_log:
+            target = entry['version']
+            changes = [(change['id'], change['before'], change['after']) for change in entry['changes']]
+            if entry['action'] == 'undo' and pos > 0 and chain[pos - 1] == target:
+                pos -= 1
+            elif entry['action'] == 'redo' and pos + 1 < len(chain) and chain[pos + 1] == target:
+                pos += 1
+            elif entry['action'] in ('undo', 'redo'):
+                # The log does not match; keep what it says is current
+                chain, pos = [target], 0
+            else:
+                parent = entry.get('parent', chain[pos] if chain else target - 1)
+                if not chain or chain[pos] != parent:
+                    chain, pos = [parent], 0
+                del chain[pos + 1:]
+                chain.append(target)
+                pos += 1
+                parents[target] = parent
+                changes_by_version[target] = changes
+                timestamps[target] = datetime.fromisoformat(entry['timestamp'])
+
+        if version is None:
+            # Files saved before versions were recorded hold the latest state.
+            # With no checkpoint at all, pass version 0 to replay the log from
+            # empty instead.
+            version = chain[pos] if chain else 0
+        known = set(parents) | set(parents.values())
+        if version not in known:
+            parents, changes_by_version, chain, pos = {}, {}, [version], 0
+
+        # The checkpoint's bookings, with IDs for files saved before IDs
+        with_ids = [dict(booking) for booking in bookings]
+        next_id = max((booking['id'] for booking in with_ids if 'id' in booking), default=-1) + 1
+        for booking in with_ids:
+            if 'id' not in booking:
+                booking['id'] = next_id
+                next_id += 1
+        slots = [None] * next_id
+        for booking in with_ids:
+            slots[booking['id']] = booking
+        slots = PersistentVector.from_iterable(slots)
+        snapshots = {version: Snapshot(version, timestamps.get(version), slots, len(with_ids))}
+
+        try:
+            snapshots = self._replay(snapshots, version, parents, changes_by_version, timestamps)
+        except ValueError:
+            # The log was written against other bookings; trust the checkpoint
+            parents, changes_by_version, chain, pos = {}, {}, [version], 0
+            snapshots = {version: snapshots[version]}
+
+        self._versions = [{
+            'snapshot': snapshots[v],
+            'changes': changes_by_version.get(v, [])
+        } for v in chain]
+        self._current = pos
+        # Never reuse a version number the audit file already holds
+        self._next_version = max([*snapshots, *(entry['version'] for entry in self.audit_log)]) + 1
+        self._next_id = max(len(snapshot._slots) for snapshot in snapshots.values())
+
+        # (timestamp, snapshot) each time the current version moved
+        self._timeline = [(datetime.fromisoformat(entry['timestamp']), snapshots[entry['version']])
+                          for entry in self.audit_log if entry['version'] in snapshots]
+        if not self._timeline:
+            self._timeline = [(datetime.now(timezone.utc), self.current())]
+
+    @staticmethod
+    def _replay(snapshots, version, parents, changes_by_version, timestamps):
+        """
+        Build every snapshot by walking the version tree out from the
+        checkpoint at version
+        """
+        snapshots = dict(snapshots)
+        children = {}
+        for child, parent in parents.items():
+            children.setdefault(parent, []).append(child)
+        pending = [version]
+        while pending:
+            current = pending.pop()
+            snapshot = snapshots[current]
+            parent = parents.get(current)
+            if parent is not None and parent not in snapshots:
+                snapshots[parent] = _replayed(snapshot, parent, timestamps.get(parent),
+                                              _reverted(changes_by_version[current]))
+                pending.append(parent)
+            for child in children.get(current, ()):
+                if child not in snapshots:
+                    snapshots[child] = _replayed(snapshot, child, timestamps[child], changes_by_version[child])
+                    pending.append(child)
+        return snapshots
+
+    def current(self):
+        return self._versions[self._current]['snapshot']
+
+    def as_of(self, when):
+        """
+        Return the snapshot that was current at the aware datetime when.
+        Raises ValueError for times before the audit log starts.
+        """
+        pos = bisect_right(self._timeline, when, key=lambda x: x[0])
+        if pos == 0:
+            raise ValueError(f"No booking history before {self._timeline[0][0].isoformat()}")
+        return self._timeline[pos - 1][1]
+
+    def can_undo(self):
+        return self._current > 0
+
+    def can_redo(self):
+        return self._current < len(self._versions) - 1
+
+    def apply(self, changes, user, action):
+        """
+        Apply (booking_id, booking) pairs as one undoable version. A booking_id
+        of None adds the booking under a new ID and a booking of None deletes
+        the ID. Returns the (booking_id, before, after) changes made.
+        """
+        snapshot = self.current()
+        applied = []
+        for booking_id, booking in changes:
+            if booking_id is None:
+                booking_id = self._next_id
+                self._next_id += 1
+            before = snapshot.get(booking_id)
+            after = dict(booking, id=booking_id) if booking is not None else None
+            applied.append((booking_id, before, after))
+            snapshot = _changed(snapshot, None, None, [(booking_id, before, after)])
+
+        # A new change discards anything that could have been redone
+        del self._versions[self._current + 1:]
+        now = datetime.now(timezone.utc)
+        parent = self.current().version
+        self._versions.append({
+            'snapshot': Snapshot(self._next_version, now, snapshot._slots, snapshot._live),
+            'changes': applied
+        })
+        self._next_version += 1
+        self._move_to(self._current + 1, now, user, action, applied, parent)
+        return applied
+
+    def undo(self, user):
+        """
+        Step back one version. Returns the reverting changes as
+        (booking_id, before, after), where after is the restored booking.
+        """
+        if not self.can_undo():
+            return None
+        reverted = _reverted(self._versions[self._current]['changes'])
+        self._move_to(self._current - 1, datetime.now(timezone.utc), user, 'undo', reverted)
+        return reverted
+
+    def redo(self, user):
+        """
+        Step forward to the version that was last undone
+        """
+        if not self.can_redo():
+            return None
+        changes = self._versions[self._current + 1]['changes']
+        self._move_to(self._current + 1, datetime.now(timezone.utc), user, 'redo', changes)
+        return changes
+
+    def _move_to(self, index, now, user, action, changes, parent=None):
+        self._current = index
+        snapshot = self.current()
+        self._timeline.append((now, snapshot))
+
+        entry = {
+            'timestamp': now.isoformat(),
+            'user': user,
+            'action': action,
+            'version': snapshot.version,
+            'changes': [{'id': booking_id, 'before': before, 'after': after}
+                        for booking_id, before, after in changes]
+        }
+        if parent is not None:
+            entry['parent'] = parent
+        self.audit_log.append(entry)
+        if self.audit_file:
+            with open(self.audit_file, 'a') as f:
+                f.write(json.dumps(entry) + "\n")
@@ -8,6 +8,7 @@ pyinstaller --noconfirm --onefile --windowed ^
     --hidden-import customtkinter ^
     --hidden-import tkcalendar ^
     --hidden-import babel.numbers ^
+    --collect-data tzdata ^
     --name "BookingScheduler" ^
     booking_scheduler_gui.py
 
@@ -0,0 +1,144 @@
+from datetime import datetime, timezone
+
+from booking_manager import BookingIndex
+
+UTC = timezone.utc
+
+
+def make_booking(booking_id, name, day, recurrence=None):
+    start = datetime(2024, 3, day, 9, 0, tzinfo=UTC)
+    return {
+        'id': booking_id,
+        'name': name,
+        'start': start.isoformat(),
+        'end': start.replace(hour=10).isoformat(),
+        'timezone': 'UTC',
+        'recurrence': recurrence
+    }
+
+
+def names(page):
+    return [booking['name'] for booking in page]
+
+
+def all_pages(index, **filters):
+    pages = []
+    cursor = None
+    while True:
+        page, cursor = index.window(cursor=cursor, **filters)
+        pages.append(names(page))
+        if cursor is None:
+            return pages
+
+
+def test_window_pages_in_start_order():
+    bookings = [make_booking(i, f"b{i}", 10 - i) for i in range(5)]
+    index = BookingIndex(bookings)
+
+    assert all_pages(index, limit=2) == [['b4', 'b3'], ['b2', 'b1'], ['b0']]
+
+
+def test_last_full_page_has_no_cursor():
+    index = BookingIndex([make_booking(i, f"b{i}", i + 1) for i in range(4)])
+
+    assert all_pages(index, limit=2) == [['b0', 'b1'], ['b2', 'b3']]
+
+
+def test_window_filters_by_date_range():
+    index = BookingIndex([make_booking(i, f"b{i}", i + 1) for i in range(10)])
+
+    page, cursor = index.window(datetime(2024, 3, 3, tzinfo=UTC), datetime(2024, 3, 6, tzinfo=UTC))
+
+    assert names(page) == ['b2', 'b3', 'b4']
+    assert cursor is None
+
+
+def test_cursor_survives_removal_between_pages():
+    bookings = [make_booking(i, f"b{i}", i + 1) for i in range(6)]
+    index = BookingIndex(bookings)
+
+    page, cursor = index.window(limit=2)
+    index.remove(bookings[0])
+    index.remove(bookings[3])
+    page, cursor = index.window(cursor=cursor, limit=2)
+
+    assert names(page) == ['b2', 'b4']
+
+
+def test_cursor_survives_insert_between_pages():
+    bookings = [make_booking(i, f"b{i}", i + 1) for i in range(4)]
+    index = BookingIndex(bookings)
+
+    page, cursor = index.window(limit=2)
+    index.add(make_booking(10, 'early', 1))
+    page, cursor = index.window(cursor=cursor, limit=2)
+
+    assert names(page) == ['b2', 'b3']
+
+
+def test_name_prefix_pages_by_name_then_start():
+    bookings = [
+        make_booking(0, 'Room B', 1),
+        make_booking(1, 'Desk', 2),
+        make_booking(2, 'Room A', 3),
+        make_booking(3, 'room b', 4),
+        make_booking(4, 'Roomy', 5),
+    ]
+    index = BookingIndex(bookings)
+
+    assert all_pages(index, name_prefix='room', limit=2) == [['Room A', 'Room B'], ['room b', 'Roomy']]
+
+
+def test_name_prefix_with_date_range():
+    bookings = [make_booking(i, 'Room' if i % 2 else 'Desk', i + 1) for i in range(10)]
+    index = BookingIndex(bookings)
+
+    page, cursor = index.window(datetime(2024, 3, 3, tzinfo=UTC), datetime(2024, 3, 8, tzinfo=UTC),
+                                name_prefix='ro')
+
+    assert [booking['id'] for booking in page] == [3, 5]
+    assert cursor is None
+
+
+def test_recurring_series_running_into_window_is_listed():
+    weekly = make_booking(0, 'standup', 1, {'type': 'weekly', 'until': '2024-04-01T23:59:00'})
+    ended = make_booking(1, 'retro', 1, {'type': 'weekly', 'until': '2024-03-05T23:59:00'})
+    index = BookingIndex([weekly, ended, make_booking(2, 'single', 12)])
+    start = datetime(2024, 3, 10, tzinfo=UTC)
+
+    assert all_pages(index, start_date=start, limit=1) == [['standup'], ['single']]
+    assert all_pages(index, start_date=start, name_prefix='s', limit=1) == [['single'], ['standup']]
+
+
+def test_update_applies_store_changes():
+    before = make_booking(0, 'old', 1)
+    after = dict(before, name='new', start=make_booking(0, 'new', 5)['start'])
+    index = BookingIndex([before])
+
+    index.update([(0, before, after)])
+
+    assert names(index.window()[0]) == ['new']
+    assert names(index.window(name_prefix='old')[0]) == []
+
+
+def test_ended_and_later_series_are_not_listed_as_running():
+    ended = make_booking(0, 'ended', 1, {'type': 'weekly', 'until': '2024-03-09T23:59:00'})
+    later = make_booking(1, 'later', 20, {'type': 'weekly', 'until': '2024-05-01T23:59:00'})
+    index = BookingIndex([ended, later])
+
+    page, cursor = index.window(datetime(2024, 3, 10, tzinfo=UTC), datetime(2024, 3, 15, tzinfo=UTC))
+
+    assert page == []
+    assert cursor is None
+
+
+def test_paging_through_running_series():
+    recurring = [make_booking(i, f"series {i}", i + 1, {'type': 'weekly', 'until': '2024-04-01T23:59:00'})
+                 for i in range(5)]
+    index = BookingIndex(recurring + [make_booking(5, 'single', 20)])
+    start = datetime(2024, 3, 10, tzinfo=UTC)
+
+    assert all_pages(index, start_date=start, limit=2) == [
+        ['series 0', 'series 1'], ['series 2', 'series 3'], ['series 4', 'single']]
+    assert all_pages(index, start_date=start, name_prefix='series', limit=2) == [
+        ['series 0', 'series 1'], ['series 2', 'series 3'], ['series 4']]
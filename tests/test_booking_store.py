@@ -0,0 +1,254 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from booking_store import BRANCH, BookingStore, PersistentVector
+
+UTC = timezone.utc
+
+
+@pytest.mark.parametrize('size', [0, 1, BRANCH - 1, BRANCH, BRANCH + 1, BRANCH ** 2, BRANCH ** 2 + 1])
+def test_vector_from_iterable(size):
+    vector = PersistentVector.from_iterable(range(size))
+
+    assert len(vector) == size
+    assert list(vector) == list(range(size))
+    assert [vector[i] for i in range(size)] == list(range(size))
+
+
+def test_vector_append_grows_levels_at_32_and_1024():
+    vector = PersistentVector()
+    for i in range(BRANCH ** 2 + 1):
+        vector = vector.append(i)
+        if i + 1 in (BRANCH, BRANCH + 1, BRANCH ** 2, BRANCH ** 2 + 1):
+            assert list(vector) == list(range(i + 1))
+
+    assert vector._shift == 10
+    assert vector[BRANCH ** 2] == BRANCH ** 2
+
+
+def test_vector_set_copies_only_the_path():
+    old = PersistentVector.from_iterable(range(BRANCH ** 2))
+
+    new = old.set(5, 'x')
+
+    assert old[5] == 5
+    assert new[5] == 'x'
+    # Every leaf but the changed one is shared
+    assert new._root[0] is not old._root[0]
+    assert all(new._root[i] is old._root[i] for i in range(1, BRANCH))
+
+
+def test_vector_rejects_out_of_range():
+    vector = PersistentVector.from_iterable(range(3))
+
+    with pytest.raises(IndexError):
+        vector[3]
+    with pytest.raises(IndexError):
+        vector.set(3, 'x')
+
+
+def names(snapshot):
+    return [booking['name'] for booking in snapshot]
+
+
+def test_undo_and_redo():
+    store = BookingStore([{'name': 'a'}, {'name': 'b'}])
+    store.apply([(None, {'name': 'c'})], 'alice', 'add')
+    store.apply([(0, None), (1, {'name': 'B'})], 'alice', 'edit')
+
+    assert names(store.current()) == ['B', 'c']
+    assert store.undo('alice') == [(1, {'name': 'B', 'id': 1}, {'name': 'b', 'id': 1}),
+                                   (0, None, {'name': 'a', 'id': 0})]
+    assert names(store.current()) == ['a', 'b', 'c']
+    store.redo('alice')
+    assert names(store.current()) == ['B', 'c']
+    assert store.redo('alice') is None
+
+
+def test_new_change_discards_redo():
+    store = BookingStore([{'name': 'a'}])
+    store.apply([(None, {'name': 'b'})], 'alice', 'add')
+    store.undo('alice')
+
+    store.apply([(None, {'name': 'c'})], 'alice', 'add')
+
+    assert not store.can_redo()
+    assert names(store.current()) == ['a', 'c']
+    assert store.current().get(2)['name'] == 'c'
+
+
+def test_snapshot_is_unaffected_by_later_writes():
+    store = BookingStore([{'name': 'a'}])
+    report = store.current()
+
+    store.apply([(0, None), (None, {'name': 'b'})], 'alice', 'edit')
+
+    assert names(report) == ['a']
+    assert len(report) == 1
+
+
+def test_as_of_reads_past_versions():
+    store = BookingStore([{'name': 'a'}])
+    store.apply([(None, {'name': 'b'})], 'alice', 'add')
+    between = datetime.now(UTC)
+    store.apply([(None, {'name': 'c'})], 'alice', 'add')
+
+    assert names(store.as_of(between)) == ['a', 'b']
+    assert names(store.as_of(datetime.now(UTC))) == ['a', 'b', 'c']
+
+
+def test_as_of_before_history_raises():
+    store = BookingStore([{'name': 'a'}])
+
+    with pytest.raises(ValueError):
+        store.as_of(datetime.now(UTC) - timedelta(days=1))
+
+
+def restart(store, audit_file):
+    """
+    Checkpoint the store as save_bookings does and load it again
+    """
+    snapshot = store.current()
+    return BookingStore(list(snapshot), snapshot.version, audit_file)
+
+
+def test_ids_and_versions_survive_restart(tmp_path):
+    audit_file = str(tmp_path / 'audit.jsonl')
+    store = BookingStore([{'name': 'a'}, {'name': 'b'}], audit_file=audit_file)
+    store.apply([(0, None)], 'alice', 'delete')
+
+    store = restart(store, audit_file)
+    store.apply([(None, {'name': 'c'})], 'bob', 'add')
+
+    assert [booking['id'] for booking in store.current()] == [1, 2]
+    assert store.current().version == 2
+    assert [entry['version'] for entry in store.audit_log] == [1, 2]
+
+
+def test_undo_after_restart_reverts_import(tmp_path):
+    audit_file = str(tmp_path / 'audit.jsonl')
+    store = BookingStore([{'name': 'keep'}], audit_file=audit_file)
+    store.apply([(None, {'name': f"imported {i}"}) for i in range(50)], 'alice', 'import')
+
+    store = restart(store, audit_file)
+    store.undo('alice')
+
+    assert names(store.current()) == ['keep']
+    store = restart(store, audit_file)
+    assert names(store.current()) == ['keep']
+    store.redo('alice')
+    assert len(store.current()) == 51
+
+
+def test_changes_after_last_checkpoint_are_replayed(tmp_path):
+    audit_file = str(tmp_path / 'audit.jsonl')
+    store = BookingStore([{'name': 'a'}], audit_file=audit_file)
+    checkpoint = store.current()
+    store.apply([(None, {'name': 'b'})], 'alice', 'add')
+    store.apply([(0, None)], 'alice', 'delete')
+
+    # The process stopped before saving again
+    store = BookingStore(list(checkpoint), checkpoint.version, audit_file)
+
+    assert names(store.current()) == ['b']
+    store.undo('alice')
+    assert names(store.current()) == ['a', 'b']
+
+
+def test_as_of_reads_earlier_sessions(tmp_path):
+    audit_file = str(tmp_path / 'audit.jsonl')
+    store = BookingStore([{'name': 'a'}], audit_file=audit_file)
+    store.apply([(None, {'name': 'b'})], 'alice', 'add')
+    between = datetime.now(UTC)
+    store.apply([(None, {'name': 'c'})], 'alice', 'add')
+
+    store = restart(store, audit_file)
+
+    assert names(store.as_of(between)) == ['a', 'b']
+
+
+def test_scheduler_keeps_ids_and_undo_across_restart(tmp_path):
+    from booking_manager import BookingScheduler
+
+    storage = str(tmp_path / 'bookings.json')
+    scheduler = BookingScheduler(storage, timezone='UTC', user='alice')
+    scheduler.add_booking('a', '2024-03-01', '09:00')
+    scheduler.add_booking('b', '2024-03-02', '09:00')
+    scheduler.delete_booking(0)
+    scheduler.save_bookings()
+
+    scheduler = BookingScheduler(storage, timezone='UTC', user='bob')
+    assert [booking['id'] for booking in scheduler.bookings] == [1]
+    assert scheduler.edit_booking(1, name='renamed')
+    # No save: the edit is replayed from the audit file
+    scheduler = BookingScheduler(storage, timezone='UTC', user='bob')
+    assert [booking['name'] for booking in scheduler.bookings] == ['renamed']
+
+    assert scheduler.undo()
+    assert scheduler.undo()
+    assert sorted(booking['name'] for booking in scheduler.bookings) == ['a', 'b']
+    assert [booking['name'] for booking in scheduler.index.window()[0]] == ['a', 'b']
+
+
+def test_log_that_does_not_match_checkpoint_is_ignored(tmp_path):
+    audit_file = str(tmp_path / 'audit.jsonl')
+    store = BookingStore([{'name': 'a'}], 0, audit_file)
+    store.apply([(0, {'name': 'renamed'})], 'alice', 'edit')
+
+    # A checkpoint at the same version, but with other bookings
+    store = BookingStore([{'name': 'other'}], 0, audit_file)
+
+    assert names(store.current()) == ['other']
+    assert not store.can_undo()
+    store.apply([(None, {'name': 'b'})], 'alice', 'add')
+    assert store.current().version == 2
+
+
+def test_scheduler_first_session_without_save(tmp_path):
+    from booking_manager import BookingScheduler
+
+    storage = str(tmp_path / 'bookings.json')
+    scheduler = BookingScheduler(storage, timezone='UTC', user='alice')
+    scheduler.add_booking('a', '2024-03-01', '09:00')
+    scheduler.add_booking('b', '2024-03-02', '09:00')
+
+    # The session ended without a checkpoint ever being written
+    scheduler = BookingScheduler(storage, timezone='UTC', user='alice')
+    assert [booking['name'] for booking in scheduler.bookings] == ['a', 'b']
+    assert scheduler.undo()
+    assert [booking['name'] for booking in scheduler.bookings] == ['a']
+
+
+def test_scheduler_checkpoints_old_files_on_load(tmp_path):
+    import json
+    from booking_manager import BookingScheduler
+
+    storage = tmp_path / 'bookings.json'
+    storage.write_text(json.dumps([{'name': 'old', 'start': '2024-03-01T09:00:00',
+                                    'end': '2024-03-01T10:00:00'}]))
+    scheduler = BookingScheduler(str(storage), timezone='UTC', user='alice')
+    scheduler.add_booking('new', '2024-03-02', '09:00')
+
+    scheduler = BookingScheduler(str(storage), timezone='UTC', user='alice')
+    assert [booking['name'] for booking in scheduler.bookings] == ['old', 'new']
+    assert scheduler.undo()
+    assert [booking['name'] for booking in scheduler.bookings] == ['old']
+
+
+def test_scheduler_change_helpers_keep_index_in_step(tmp_path, capsys):
+    from booking_manager import BookingScheduler
+
+    scheduler = BookingScheduler(str(tmp_path / 'bookings.json'), timezone='UTC', user='alice')
+    booking = {'name': 'a', 'start': '2024-03-01T09:00:00+00:00', 'end': '2024-03-01T10:00:00+00:00',
+               'timezone': 'UTC', 'recurrence': None}
+    [(booking_id, before, after)] = scheduler.apply_changes([(None, booking)], 'add')
+
+    assert before is None and after['id'] == booking_id
+    assert [b['name'] for b in scheduler.index.window()[0]] == ['a']
+    assert scheduler.undo_changes() == [(booking_id, after, None)]
+    assert scheduler.index.window()[0] == []
+    assert scheduler.undo_changes() is None
+    assert scheduler.redo_changes() == [(booking_id, None, after)]
+    assert len(scheduler.index) == 1
+    assert capsys.readouterr().out == ''
@@ -0,0 +1,141 @@
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from booking_manager import BookingScheduler, local_to_utc, utc_to_local
+
+UTC = timezone.utc
+NEW_YORK = 'America/New_York'
+
+
+def make_scheduler(tmp_path, zone=NEW_YORK):
+    return BookingScheduler(str(tmp_path / 'bookings.json'), timezone=zone, user='tester')
+
+
+def add_weekly_standup(scheduler):
+    # US daylight saving time starts on 2024-03-10
+    assert scheduler.add_booking('standup', '2024-03-01', '09:00',
+                                 recurrence={'type': 'weekly', 'until': '2024-04-01T23:59:00'})
+    return next(iter(scheduler.bookings))
+
+
+def test_weekly_series_keeps_local_time_across_dst(tmp_path):
+    scheduler = make_scheduler(tmp_path)
+    booking = add_weekly_standup(scheduler)
+
+    instances = scheduler.get_recurrence_instances(
+        booking, datetime(2024, 3, 1, tzinfo=UTC), datetime(2024, 4, 2, tzinfo=UTC))
+    starts = [datetime.fromisoformat(instance['start']) for instance in instances]
+
+    assert [utc_to_local(start, NEW_YORK).hour for start in starts] == [9] * 5
+    assert [start.hour for start in starts] == [14, 14, 13, 13, 13]
+
+
+def test_instance_overlapping_window_start_is_included(tmp_path):
+    scheduler = make_scheduler(tmp_path)
+    booking = add_weekly_standup(scheduler)
+    window_start = local_to_utc(datetime(2024, 3, 15, 9, 30), NEW_YORK)
+
+    instances = scheduler.get_recurrence_instances(booking, window_start, window_start)
+
+    assert [instance['start'] for instance in instances] == ['2024-03-15T13:00:00+00:00']
+
+
+def test_conflict_after_dst_uses_local_time(tmp_path):
+    scheduler = make_scheduler(tmp_path)
+    add_weekly_standup(scheduler)
+
+    assert not scheduler.add_booking('clash', '2024-03-15', '09:30')
+    # 14:30 in Berlin is 09:30 in New York while Europe is still on winter time
+    assert not scheduler.add_booking('berlin', '2024-03-15', '14:30', timezone='Europe/Berlin')
+    assert scheduler.add_booking('after', '2024-03-15', '10:00')
+
+
+def test_memoized_expansion_matches_fresh_expansion(tmp_path):
+    scheduler = make_scheduler(tmp_path)
+    booking = add_weekly_standup(scheduler)
+    window = (datetime(2024, 3, 8, tzinfo=UTC), datetime(2024, 3, 20, tzinfo=UTC))
+
+    first = scheduler.get_recurrence_instances(booking, *window)
+    second = scheduler.get_recurrence_instances(booking, *window)
+
+    assert first == second
+    assert len(first) == 2
+
+
+def test_series_expands_only_up_to_the_window(tmp_path):
+    scheduler = make_scheduler(tmp_path)
+    booking = add_weekly_standup(scheduler)
+
+    scheduler.get_recurrence_instances(booking, datetime(2024, 3, 1, tzinfo=UTC), datetime(2024, 3, 9, tzinfo=UTC))
+    # The two instances in the window, and the first one after it
+    assert len(scheduler._series[booking['id']].instances) == 3
+    instances = scheduler.get_recurrence_instances(
+        booking, datetime(2024, 3, 1, tzinfo=UTC), datetime(2024, 4, 2, tzinfo=UTC))
+    assert len(instances) == 5
+
+
+def test_edit_drops_the_expanded_series(tmp_path):
+    scheduler = make_scheduler(tmp_path)
+    booking = add_weekly_standup(scheduler)
+    window = (datetime(2024, 3, 1, tzinfo=UTC), datetime(2024, 4, 2, tzinfo=UTC))
+    scheduler.get_recurrence_instances(booking, *window)
+
+    assert scheduler.edit_booking(booking['id'], start_time='11:00')
+    assert scheduler.add_booking('clash', '2024-03-15', '09:30') is True
+
+    # An older snapshot of the same booking is expanded from its own times
+    instances = scheduler.get_recurrence_instances(booking, *window)
+    assert instances[0]['start'] == '2024-03-01T14:00:00+00:00'
+
+
+@pytest.mark.parametrize('zone', [NEW_YORK, 'Europe/Berlin', 'Australia/Lord_Howe', 'Asia/Kolkata'])
+def test_conversions_match_zoneinfo_around_transitions(zone):
+    # Every quarter hour through a year covers each transition of the zone
+    wall = datetime(2024, 1, 1)
+    while wall < datetime(2025, 1, 1):
+        expected = (wall - ZoneInfo(zone).utcoffset(wall)).replace(tzinfo=UTC)
+        assert local_to_utc(wall, zone) == expected
+        instant = wall.replace(tzinfo=UTC)
+        assert utc_to_local(instant, zone) == instant.astimezone(ZoneInfo(zone)).replace(tzinfo=None)
+        wall += timedelta(minutes=15)
+
+
+def test_old_naive_bookings_load_as_utc(tmp_path):
+    storage = tmp_path / 'bookings.json'
+    storage.write_text('[{"name": "old", "start": "2024-01-01T09:00:00", "end": "2024-01-01T10:00:00"}]')
+
+    scheduler = BookingScheduler(str(storage), timezone=NEW_YORK, user='tester')
+    booking = next(iter(scheduler.bookings))
+
+    assert booking['timezone'] == 'UTC'
+    assert booking['start'] == '2024-01-01T09:00:00+00:00'
+
+
+def test_day_view_uses_and_labels_display_zone(tmp_path, capsys):
+    scheduler = make_scheduler(tmp_path, zone='UTC')
+    scheduler.add_booking('evening', '2024-03-05', '21:00', timezone=NEW_YORK)
+    capsys.readouterr()
+
+    assert scheduler.set_timezone(NEW_YORK)
+    scheduler.show_day_bookings(2024, 3, 5)
+    output = capsys.readouterr().out
+
+    assert f"Bookings for 2024-03-05 ({NEW_YORK})" in output
+    assert "21:00" in output
+
+
+def test_set_timezone_rejects_unknown_zone(tmp_path):
+    scheduler = make_scheduler(tmp_path)
+
+    assert not scheduler.set_timezone('Mars/Base')
+    assert scheduler.timezone == NEW_YORK
+
+
+def test_display_zone_defaults_to_system_zone(tmp_path, monkeypatch):
+    monkeypatch.setenv('TZ', 'Asia/Tokyo')
+
+    scheduler = BookingScheduler(str(tmp_path / 'bookings.json'), user='tester')
+
+    assert scheduler.timezone == 'Asia/Tokyo'